@@ -1,174 +1,57 @@
 # This program provides the population distribution of the strategies over generations
 # A mutation rate is introduced to the population to simulate the evolution of strategies
+# The shared strategies and contests live in core.py; its parameters are read through the module
+# so that changes made to them after import still apply
 
 import random
-from statistics import mean
+
+import numpy as np
+
+import core
+from core import C, D, R, Strategy, Mouse, Hawk, Bully, Retaliator, LongRetaliator, play_contest
 
 # Adjustable parameters
-MAX_MOVES = 10
-P_INJURY = 0.1        # Probability of serious injury from a single D act
-TIME_BONUS_START = 20
-TIME_BONUS_DECREMENT = 2
-CONTESTS_PER_MATCHUP = 2000     # Increase for more stable averages in non-evolution runs
 POPULATION_SIZE = 200           # Number of individuals in the evolving population
 GENERATIONS = 50                # Number of generations to simulate
 MUTATION_RATE = 0.01            # Probability of a mutant strategy appearing
-PROBE_PROB = 0.05               # Probability that Prober-Retaliator probes on first move
-
-# Payoffs
-WIN_PAYOFF = 60        # Payof for winning (without time bonus)
-SERIOUS_INJURY = -100
-SCRATCH = -2
-
-# Base Strategy Class
-class Strategy:
-    def reset(self):
-        pass
-    def choose_move(self, my_history, opp_history):
-        raise NotImplementedError
-
-# Example of a more complex strategy that looks at the full history
-class Mouse(Strategy):
-    def __init__(self):
-        self.reset()
-    def reset(self):
-        self.opponent_d_played = False
-    def choose_move(self, my_history, opp_history):
-        if 'D' in opp_history:
-            self.opponent_d_played = True
-        if len(my_history) < MAX_MOVES and not self.opponent_d_played:
-            return 'C'
-        else:
-            return 'R'
-
-class Hawk(Strategy):
-    def reset(self):
-        pass
-    def choose_move(self, my_history, opp_history):
-        return 'D'
-
-class Bully(Strategy):
-    def __init__(self):
-        self.reset()
-    def reset(self):
-        self.first_move = True
-        self.d_streak = 0
-    def choose_move(self, my_history, opp_history):
-        if self.first_move:
-            self.first_move = False
-            return 'D'
-        if len(opp_history) > 0 and opp_history[-1] == 'D':
-            self.d_streak += 1
-        else:
-            self.d_streak = 0
-        if self.d_streak >= 2:
-            return 'R'
-        return 'C'
-
-class Retaliator(Strategy):
-    def __init__(self):
-        self.reset()
-    def reset(self):
-        self.state = 'C'
-        self.move_count = 0
-    def choose_move(self, my_history, opp_history):
-        self.move_count += 1
-        if self.move_count > MAX_MOVES:
-            return 'R'
-        if len(opp_history) > 0 and opp_history[-1] == 'D':
-            return 'D'
-        return 'C'
 
+# Unlike the core Prober-Retaliator, this one goes back to D whenever the opponent was not dangerous
 class ProberRetaliator(Strategy):
+    __slots__ = ('move_count', 'has_probed')
     def __init__(self):
         self.reset()
     def reset(self):
         self.move_count = 0
         self.has_probed = False
-    def choose_move(self, my_history, opp_history):
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
         self.move_count += 1
-        if self.move_count > MAX_MOVES:
-            return 'R'
+        if self.move_count > core.MAX_MOVES:
+            return R
         # Attempt a probe on the first move with certain probability
-        if not self.has_probed and len(my_history) == 0:
-            if random.random() < PROBE_PROB:
+        if not self.has_probed and turn == 0:
+            if random.random() < core.PROBE_PROB:
                 self.has_probed = True
-                return 'D'
+                return D
         # If opponent was dangerous last turn, cooperate to appear non-threatening
-        if len(opp_history) > 0 and opp_history[-1] == 'D':
-            return 'C'
+        if last_opp_move == D:
+            return C
         # Otherwise, if we have probed before, continue to be dangeros
         if self.has_probed:
-            return 'D'
-        return 'C'
-
-# New, more complex strategy that looks further back in history
-class LongRetaliator(Strategy):
-    def __init__(self):
-        self.reset()
-    def reset(self):
+            return D
+        return C
+    def reset_batch(self, n):
         self.move_count = 0
-    def choose_move(self, my_history, opp_history):
+        # Probes are drawn up front, one per contest
+        self.has_probed = core.rng.random(n) < core.PROBE_PROB
+    def start_outcomes(self):
+        return [(core.PROBE_PROB, {'has_probed': True}), (1 - core.PROBE_PROB, {'has_probed': False})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
         self.move_count += 1
-        if self.move_count > MAX_MOVES:
-            return 'R'
-        # If the opponent has been dangerous in any of the last two moves, retaliate now
-        if len(opp_history) >= 2 and ('D' in opp_history[-2:]):
-            return 'D'
-        # Else cooperate
-        return 'C'
-
-def play_contest(strategyA, strategyB):
-    strategyA.reset()
-    strategyB.reset()
-    A_history, B_history = [], []
-    A_score, B_score = 0, 0
-
-    for moves in range(MAX_MOVES):
-        A_move = strategyA.choose_move(A_history, B_history)
-        B_move = strategyB.choose_move(B_history, A_history)
-        A_history.append(A_move)
-        B_history.append(B_move)
-
-        # Check retreats
-        if A_move == 'R' and B_move == 'R':
-            return (A_score, B_score)
-        elif A_move == 'R':
-            time_bonus = TIME_BONUS_START - TIME_BONUS_DECREMENT * moves
-            return (A_score, B_score + WIN_PAYOFF + max(time_bonus, 0))
-        elif B_move == 'R':
-            time_bonus = TIME_BONUS_START - TIME_BONUS_DECREMENT * moves
-            return (A_score + WIN_PAYOFF + max(time_bonus, 0), B_score)
-
-        # Handle dangerous acts
-        if A_move == 'D':
-            if random.random() < P_INJURY:
-                # B injured, A wins
-                time_bonus = TIME_BONUS_START - TIME_BONUS_DECREMENT * moves
-                return (A_score + WIN_PAYOFF + max(time_bonus, 0), B_score + SERIOUS_INJURY)
-            else:
-                B_score += SCRATCH
-
-        if B_move == 'D':
-            if random.random() < P_INJURY:
-                # A injured, B wins
-                time_bonus = TIME_BONUS_START - TIME_BONUS_DECREMENT * moves
-                return (A_score + SERIOUS_INJURY, B_score + WIN_PAYOFF + max(time_bonus, 0))
-            else:
-                A_score += SCRATCH
-
-    # If reached here, draw with no one retreating or injured
-    return (A_score, B_score)
-
-def average_payoff(strategyA_class, strategyB_class, contests=CONTESTS_PER_MATCHUP):
-    # Only return average payoff to strategyA for static tests
-    A_payoffs = []
-    for _ in range(contests):
-        A = strategyA_class()
-        B = strategyB_class()
-        A_score, B_score = play_contest(A, B)
-        A_payoffs.append(A_score)
-    return mean(A_payoffs)
+        if self.move_count > core.MAX_MOVES:
+            return np.full(last_opp.shape, R, dtype=np.int8)
+        if turn == 0:
+            return np.where(self.has_probed, D, C)
+        return np.where((last_opp != D) & self.has_probed, D, C)
 
 def evolutionary_simulation(strategies, initial_distribution, generations=GENERATIONS, population_size=POPULATION_SIZE):
     """
@@ -182,58 +65,37 @@ def evolutionary_simulation(strategies, initial_distribution, generations=GENERA
     # Represent population as a list of tuples (StrategyClass, frequency)
     population = [(s, f) for s, f in zip(strategies, initial_distribution)]
 
+    num_strategies = len(strategies)
+    # play_contest resets its players, so two reusable instances per strategy cover every pairing
+    players = [(s(), s()) for s in strategies]
     for gen in range(generations):
-        # Create a list of individuals based on the current population distribution
-        individuals = []
-        for strat, freq in population:
-            count = int(freq * population_size)
-            individuals.extend([strat() for _ in range(count)])
-        
-        # If due to rounding we have fewer or more than population_size, adjust randomly
-        while len(individuals) < population_size:
-            # Add a random individual
-            chosen_strat = random.choices(strategies, weights=[f for _, f in population])[0]
-            individuals.append(chosen_strat())
-        while len(individuals) > population_size:
-            # Remove a random individual
-            individuals.pop()
+        # Represent the individuals as an array of indices into strategies, based on the current distribution
+        probs = np.array([f for _, f in population])
+        probs /= probs.sum()
+        counts = (probs * population_size).astype(np.int64)
+        # Individuals lost to rounding down are drawn randomly from the distribution
+        counts += core.rng.multinomial(population_size - counts.sum(), probs)
+        tags = np.repeat(np.arange(num_strategies, dtype=np.int8), counts)
 
         # Pair individuals randomly and let them compete
-        random.shuffle(individuals)
-        payoffs = [0]*population_size
-        for i in range(0, population_size, 2):
-            A = individuals[i]
-            B = individuals[i+1]
-            A_score, B_score = play_contest(A, B)
-            payoffs[i] += A_score
-            payoffs[i+1] += B_score
+        core.rng.shuffle(tags)
+        pairs = tags.reshape(-1, 2)
+        pair_payoffs = np.zeros(pairs.shape)
+        for i, (a, b) in enumerate(pairs):
+            pair_payoffs[i] = play_contest(players[a][0], players[b][1])
+        payoffs = pair_payoffs.ravel()
 
         # Compute total payoff by strategy class
-        strat_payoffs = {s: 0 for s in strategies}
-        strat_counts = {s: 0 for s in strategies}
-        for ind, payoff in zip(individuals, payoffs):
-            # Identify strategy class of individual
-            for s in strategies:
-                if isinstance(ind, s):
-                    strat_payoffs[s] += payoff
-                    strat_counts[s] += 1
-                    break
-        
+        strat_payoffs = np.bincount(tags, weights=payoffs, minlength=num_strategies)
+        strat_counts = np.bincount(tags, minlength=num_strategies)
+
         # Compute average payoffs and update frequencies
-        new_population = []
-        total_fitness = 0.0
-        for s in strategies:
-            if strat_counts[s] > 0:
-                avg_pay = strat_payoffs[s] / strat_counts[s]
-            else:
-                avg_pay = 0
-            # Fitness function could be a positive transform of payoff
-            fitness = max(avg_pay + 100, 0.01)  # shift payoff by +100 to avoid negatives
-            new_population.append((s, fitness))
-            total_fitness += fitness
+        avg_pay = np.where(strat_counts > 0, strat_payoffs / np.maximum(strat_counts, 1), 0.0)
+        # Fitness function could be a positive transform of payoff
+        fitness = np.maximum(avg_pay + 100, 0.01)  # shift payoff by +100 to avoid negatives
 
         # Normalize frequencies
-        population = [(s, f/total_fitness) for s, f in new_population]
+        population = list(zip(strategies, (fitness / fitness.sum()).tolist()))
 
         # Mutation step: With some probability, introduce a random strategy
         if random.random() < MUTATION_RATE:
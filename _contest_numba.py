@@ -0,0 +1,127 @@
+# This module runs the contests of core.py compiled with numba
+# Strategies are integer tags and their internal state is a fixed 4-int tuple, so the whole
+# contest stays in nopython mode
+
+import numpy as np
+from numba import njit, prange
+
+# Move codes, the same as in the simulation scripts
+C, D, R = 0, 1, 2
+
+# Strategy tags (the `tag` attribute of the strategy classes)
+MOUSE, HAWK, BULLY, RETALIATOR, PROBER_RETALIATOR, LONG_RETALIATOR = 0, 1, 2, 3, 4, 5
+
+# params is the tuple (MAX_MOVES, P_INJURY, TIME_BONUS_START, TIME_BONUS_DECREMENT,
+#                      WIN_PAYOFF, SERIOUS_INJURY, SCRATCH, PROBE_PROB)
+# so changing the parameters in the scripts does not require recompiling
+
+@njit(cache=True, fastmath=True)
+def move_for(tag, state, last_opp, turn, params):
+    # state is (move_count, memory, has_probed, opp_ever_D) where memory is the Bully's
+    # D streak, the (Prober-)Retaliator's state or the Long-Retaliator's older opponent move
+    max_moves = params[0]
+    probe_prob = params[7]
+    move_count, memory, has_probed, opp_ever_D = state
+    move_count += 1
+    if last_opp == D:
+        opp_ever_D = 1
+
+    if tag == MOUSE:
+        if opp_ever_D == 1 or turn >= max_moves:
+            move = R
+        else:
+            move = C
+    elif tag == HAWK:
+        move = D
+    elif tag == BULLY:
+        if move_count == 1:
+            move = D
+        else:
+            if last_opp == D:
+                memory += 1
+            else:
+                memory = 0
+            if memory >= 2:
+                move = R
+            else:
+                move = C
+    elif tag == RETALIATOR:
+        if move_count > max_moves:
+            move = R
+        else:
+            if turn > 0:
+                if last_opp == D:
+                    memory = D
+                else:
+                    memory = C
+            move = memory
+    elif tag == PROBER_RETALIATOR:
+        if move_count > max_moves:
+            move = R
+        elif has_probed == 0 and turn == 0 and np.random.random() < probe_prob:
+            has_probed = 1
+            memory = D
+            move = D
+        else:
+            if turn > 0:
+                if last_opp == D:
+                    memory = C
+                elif not (has_probed == 1 and memory == D):
+                    memory = C
+            move = memory
+    elif tag == LONG_RETALIATOR:
+        if move_count > max_moves:
+            move = R
+        elif turn >= 2 and (last_opp == D or memory == D):
+            move = D
+        else:
+            move = C
+        memory = last_opp
+    else:
+        raise ValueError("unknown strategy tag")
+
+    return move, (move_count, memory, has_probed, opp_ever_D)
+
+@njit(cache=True, fastmath=True)
+def contest(tagA, tagB, params):
+    max_moves, p_injury, time_bonus_start, time_bonus_decrement, win_payoff, serious_injury, scratch, probe_prob = params
+    stateA = (0, 0, 0, 0)
+    stateB = (0, 0, 0, 0)
+    last_A, last_B = C, C
+    A_score, B_score = 0, 0
+
+    for moves in range(max_moves):
+        A_move, stateA = move_for(tagA, stateA, last_B, moves, params)
+        B_move, stateB = move_for(tagB, stateB, last_A, moves, params)
+        last_A, last_B = A_move, B_move
+        time_bonus = max(time_bonus_start - time_bonus_decrement * moves, 0)
+
+        # Check retreats
+        if A_move == R and B_move == R:
+            return A_score, B_score
+        elif A_move == R:
+            return A_score, B_score + win_payoff + time_bonus
+        elif B_move == R:
+            return A_score + win_payoff + time_bonus, B_score
+
+        # Handle dangerous acts
+        if A_move == D:
+            if np.random.random() < p_injury:
+                return A_score + win_payoff + time_bonus, B_score + serious_injury
+            B_score += scratch
+
+        if B_move == D:
+            if np.random.random() < p_injury:
+                return A_score + serious_injury, B_score + win_payoff + time_bonus
+            A_score += scratch
+
+    return A_score, B_score
+
+@njit(cache=True, parallel=True)
+def average_payoff(tagA, tagB, contests, params):
+    # Only return average payoff to strategyA; numba keeps a separate random state per thread
+    total = 0.0
+    for _ in prange(contests):
+        A_score, B_score = contest(tagA, tagB, params)
+        total += A_score
+    return total / contests
@@ -0,0 +1,479 @@
+# Shared implementation of the contests: parameters, strategies and payoff computations
+# OriginalSimulation, NewStrategy and GenerationalResult are thin scripts built on this module
+
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+try:
+    import _contest_numba
+except ImportError:     # numba is optional, simulations fall back to NumPy without it
+    _contest_numba = None
+
+# Adjustable parameters
+MAX_MOVES = 10
+P_INJURY = 0.1        # Probability of serious injury from a single D act
+TIME_BONUS_START = 20
+TIME_BONUS_DECREMENT = 2
+CONTESTS_PER_MATCHUP = 5000   # Increase for more stable averages
+EXACT_PAYOFFS = True          # Compute average payoffs exactly; False estimates them by simulation
+
+# Payoffs
+WIN_PAYOFF = 60        # Payoff for winning (without time bonus)
+SERIOUS_INJURY = -100
+SCRATCH = -2
+
+# Time bonus for a win on each move, looked up instead of recomputed inside the contests
+def time_bonus_table():
+    return tuple(max(TIME_BONUS_START - TIME_BONUS_DECREMENT * m, 0) for m in range(MAX_MOVES))
+
+TIME_BONUS = time_bonus_table()
+
+PROBE_PROB = 0.05       # Probability that Prober-Retaliator probes first move
+
+# Parameters copied into the worker processes of payoff_matrix
+PARAM_NAMES = ('MAX_MOVES', 'P_INJURY', 'TIME_BONUS_START', 'TIME_BONUS_DECREMENT', 'EXACT_PAYOFFS',
+               'WIN_PAYOFF', 'SERIOUS_INJURY', 'SCRATCH', 'PROBE_PROB')
+
+# Move codes (no previous move counts as C)
+C, D, R = 0, 1, 2
+
+rng = np.random.default_rng()
+
+class Strategy:
+    __slots__ = ()
+    tag = None      # Identifies the strategy to the numba-compiled contests; not inherited by subclasses
+    def reset(self):
+        pass
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        raise NotImplementedError
+    # Batched versions: play N independent contests at once, attributes hold one entry per contest
+    def reset_batch(self, n):
+        pass
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        raise NotImplementedError
+    # Starting points for exact payoffs as (probability, attributes to set after reset_batch).
+    # None means the payoffs are estimated by simulation; a deterministic strategy returns [(1.0, {})].
+    # It is not inherited: a subclass is simulated unless it defines its own start_outcomes.
+    def start_outcomes(self):
+        return None
+
+class Mouse(Strategy):
+    __slots__ = ('opponent_d_played',)
+    tag = 0
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.opponent_d_played = False
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        if opp_ever_D:
+            self.opponent_d_played = True
+        if self.opponent_d_played:
+            return R
+        if turn < MAX_MOVES:
+            return C
+        else:
+            return R
+    def reset_batch(self, n):
+        self.opponent_d_played = np.zeros(n, dtype=bool)
+    def start_outcomes(self):
+        return [(1.0, {})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        self.opponent_d_played |= opp_ever_D
+        if turn >= MAX_MOVES:
+            return np.full(last_opp.shape, R, dtype=np.int8)
+        return np.where(self.opponent_d_played, R, C)
+
+class Hawk(Strategy):
+    __slots__ = ()
+    tag = 1
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        return D
+    def start_outcomes(self):
+        return [(1.0, {})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        return np.full(last_opp.shape, D, dtype=np.int8)
+
+class Bully(Strategy):
+    __slots__ = ('first_move', 'd_streak')
+    tag = 2
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.first_move = True
+        self.d_streak = 0
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        if self.first_move:
+            self.first_move = False
+            return D
+        if last_opp_move == D:
+            self.d_streak += 1
+        else:
+            self.d_streak = 0
+        if self.d_streak >= 2:
+            return R
+        return C
+    def reset_batch(self, n):
+        self.first_move = True
+        self.d_streak = np.zeros(n, dtype=np.int32)
+    def start_outcomes(self):
+        return [(1.0, {})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        if self.first_move:
+            self.first_move = False
+            return np.full(last_opp.shape, D, dtype=np.int8)
+        self.d_streak = np.where(last_opp == D, self.d_streak + 1, 0)
+        return np.where(self.d_streak >= 2, R, C)
+
+class Retaliator(Strategy):
+    __slots__ = ('state', 'move_count')
+    tag = 3
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.state = C
+        self.move_count = 0
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return R
+        if turn > 0:
+            if last_opp_move == D:
+                self.state = D
+            else:
+                self.state = C
+        return self.state
+    def reset_batch(self, n):
+        self.state = np.full(n, C, dtype=np.int8)
+        self.move_count = 0
+    def start_outcomes(self):
+        return [(1.0, {})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return np.full(last_opp.shape, R, dtype=np.int8)
+        self.state = np.where(last_opp == D, D, C)
+        return self.state
+
+class ProberRetaliator(Strategy):
+    __slots__ = ('state', 'move_count', 'has_probed')
+    tag = 4
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.state = C
+        self.move_count = 0
+        self.has_probed = False
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return R
+        # Attempt probe on first move
+        if not self.has_probed and turn == 0:
+            if random.random() < PROBE_PROB:
+                self.has_probed = True
+                self.state = D
+                return D
+        if turn > 0:
+            if last_opp_move == D:
+                self.state = C
+            else:
+                if self.has_probed and self.state == D:
+                    self.state = D
+                else:
+                    self.state = C
+        return self.state
+    def reset_batch(self, n):
+        self.state = np.full(n, C, dtype=np.int8)
+        self.move_count = 0
+        # Probes are drawn up front, one per contest
+        self.has_probed = rng.random(n) < PROBE_PROB
+    def start_outcomes(self):
+        return [(PROBE_PROB, {'has_probed': True}), (1 - PROBE_PROB, {'has_probed': False})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return np.full(last_opp.shape, R, dtype=np.int8)
+        if turn == 0:
+            self.state = np.where(self.has_probed, D, C)
+        else:
+            # A probe keeps going until the opponent answers with D
+            self.state = np.where(self.has_probed & (self.state == D) & (last_opp != D), D, C)
+        return self.state
+
+# Retaliates if the opponent has been dangerous in any of the last two moves
+class LongRetaliator(Strategy):
+    __slots__ = ('move_count', 'recent', 'prev_opp')
+    tag = 5
+    def __init__(self):
+        self.reset()
+    def reset(self):
+        self.move_count = 0
+        self.recent = [C, C]   # Ring buffer of the opponent's last two moves
+    def choose_move(self, turn, last_opp_move, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return R
+        if turn > 0:
+            self.recent[turn % 2] = last_opp_move
+        # If the opponent has been dangerous in any of the last two moves, retaliate now
+        if turn >= 2 and D in self.recent:
+            return D
+        # Else cooperate
+        return C
+    def reset_batch(self, n):
+        self.move_count = 0
+        self.prev_opp = np.full(n, C, dtype=np.int8)
+    def start_outcomes(self):
+        return [(1.0, {})]
+    def choose_moves(self, turn, last_opp, opp_ever_D):
+        self.move_count += 1
+        if self.move_count > MAX_MOVES:
+            return np.full(last_opp.shape, R, dtype=np.int8)
+        recent_d = (last_opp == D) | (self.prev_opp == D)
+        self.prev_opp = last_opp
+        if turn < 2:
+            return np.full(last_opp.shape, C, dtype=np.int8)
+        return np.where(recent_d, D, C)
+
+def has_batch_moves(strategy_class):
+    # Strategies written with only reset/choose_move are played one contest at a time, and so are
+    # subclasses that override choose_move without also overriding choose_moves
+    for cls in strategy_class.__mro__:
+        if 'choose_move' in cls.__dict__:
+            return cls is not Strategy and 'choose_moves' in cls.__dict__
+
+def play_contest(strategyA, strategyB):
+    strategyA.reset()
+    strategyB.reset()
+    A_score, B_score = 0, 0
+    last_A, last_B = C, C
+    A_ever_D, B_ever_D = False, False
+    # Look the move functions up once instead of on every move
+    choose_A = strategyA.choose_move
+    choose_B = strategyB.choose_move
+
+    for moves in range(MAX_MOVES):
+        A_move = choose_A(moves, last_B, B_ever_D)
+        B_move = choose_B(moves, last_A, A_ever_D)
+        last_A, last_B = A_move, B_move
+        A_ever_D = A_ever_D or A_move == D
+        B_ever_D = B_ever_D or B_move == D
+
+        # Check retreats
+        if A_move == R and B_move == R:
+            return (A_score, B_score)
+        elif A_move == R:
+            return (A_score, B_score + WIN_PAYOFF + TIME_BONUS[moves])
+        elif B_move == R:
+            return (A_score + WIN_PAYOFF + TIME_BONUS[moves], B_score)
+
+        # Handle dangerous acts
+        if A_move == D:
+            if random.random() < P_INJURY:
+                # B injured, A wins
+                return (A_score + WIN_PAYOFF + TIME_BONUS[moves], B_score + SERIOUS_INJURY)
+            else:
+                B_score += SCRATCH
+
+        if B_move == D:
+            if random.random() < P_INJURY:
+                # A injured, B wins
+                return (A_score + SERIOUS_INJURY, B_score + WIN_PAYOFF + TIME_BONUS[moves])
+            else:
+                A_score += SCRATCH
+
+    # If reached here, draw with no one retreating or injured
+    return (A_score, B_score)
+
+def batch_play(A_cls, B_cls, N):
+    # Same rules as play_contest, but N independent contests are played side by side
+    A = A_cls()
+    B = B_cls()
+    A.reset_batch(N)
+    B.reset_batch(N)
+    injuryA = rng.random((N, MAX_MOVES)) < P_INJURY   # A's D act seriously injures B
+    injuryB = rng.random((N, MAX_MOVES)) < P_INJURY   # B's D act seriously injures A
+    A_scores = np.zeros(N, dtype=np.int32)
+    B_scores = np.zeros(N, dtype=np.int32)
+    last_A = np.full(N, C, dtype=np.int8)
+    last_B = np.full(N, C, dtype=np.int8)
+    A_ever_D = np.zeros(N, dtype=bool)
+    B_ever_D = np.zeros(N, dtype=bool)
+    alive = np.ones(N, dtype=bool)
+
+    for moves in range(MAX_MOVES):
+        A_move = A.choose_moves(moves, last_B, B_ever_D)
+        B_move = B.choose_moves(moves, last_A, A_ever_D)
+        A_ever_D = A_ever_D | (A_move == D)
+        B_ever_D = B_ever_D | (B_move == D)
+        time_bonus = TIME_BONUS[moves]
+
+        # Check retreats
+        A_retreats = alive & (A_move == R)
+        B_retreats = alive & (B_move == R)
+        A_scores[B_retreats & ~A_retreats] += WIN_PAYOFF + time_bonus
+        B_scores[A_retreats & ~B_retreats] += WIN_PAYOFF + time_bonus
+        alive &= ~(A_retreats | B_retreats)
+
+        # Handle dangerous acts
+        A_dangerous = alive & (A_move == D)
+        B_injured = A_dangerous & injuryA[:, moves]
+        A_scores[B_injured] += WIN_PAYOFF + time_bonus
+        B_scores[B_injured] += SERIOUS_INJURY
+        B_scores[A_dangerous & ~B_injured] += SCRATCH
+        alive &= ~B_injured
+
+        B_dangerous = alive & (B_move == D)
+        A_injured = B_dangerous & injuryB[:, moves]
+        B_scores[A_injured] += WIN_PAYOFF + time_bonus
+        A_scores[A_injured] += SERIOUS_INJURY
+        A_scores[B_dangerous & ~A_injured] += SCRATCH
+        alive &= ~A_injured
+
+        if not alive.any():
+            break
+        last_A, last_B = A_move, B_move
+
+    # Contests still alive here are draws with no one retreating or injured
+    return (A_scores, B_scores)
+
+def exact_payoff(strategyA_class, strategyB_class):
+    # Expected payoff to strategyA without sampling. Once their starting draws are fixed the
+    # strategies are deterministic and every injury ends the contest, so each starting point
+    # has a single live path; follow it carrying the probability the contest is still going.
+    if not (has_batch_moves(strategyA_class) and has_batch_moves(strategyB_class)):
+        return None
+    if 'start_outcomes' not in strategyA_class.__dict__ or 'start_outcomes' not in strategyB_class.__dict__:
+        return None
+    A = strategyA_class()
+    B = strategyB_class()
+    A_starts = A.start_outcomes()
+    B_starts = B.start_outcomes()
+    if A_starts is None or B_starts is None:
+        return None
+    starts = [(pA * pB, setA, setB) for pA, setA in A_starts for pB, setB in B_starts]
+    n = len(starts)
+    A.reset_batch(n)
+    B.reset_batch(n)
+    for name in A_starts[0][1]:
+        setattr(A, name, np.array([setA[name] for _, setA, _ in starts]))
+    for name in B_starts[0][1]:
+        setattr(B, name, np.array([setB[name] for _, _, setB in starts]))
+    weights = np.array([p for p, _, _ in starts])
+
+    alive = np.ones(n)        # Probability that the contest is still going
+    A_score = np.zeros(n)     # A's score so far along the live path
+    expected = np.zeros(n)
+    last_A = np.full(n, C, dtype=np.int8)
+    last_B = np.full(n, C, dtype=np.int8)
+    A_ever_D = np.zeros(n, dtype=bool)
+    B_ever_D = np.zeros(n, dtype=bool)
+
+    for moves in range(MAX_MOVES):
+        A_move = A.choose_moves(moves, last_B, B_ever_D)
+        B_move = B.choose_moves(moves, last_A, A_ever_D)
+        A_ever_D = A_ever_D | (A_move == D)
+        B_ever_D = B_ever_D | (B_move == D)
+        time_bonus = TIME_BONUS[moves]
+
+        # Check retreats
+        retreat = (A_move == R) | (B_move == R)
+        A_wins = (B_move == R) & (A_move != R)
+        expected += np.where(retreat, alive * (A_score + A_wins * (WIN_PAYOFF + time_bonus)), 0)
+        alive = np.where(retreat, 0, alive)
+
+        # Handle dangerous acts, each one ends the contest with probability P_INJURY
+        A_dangerous = A_move == D
+        expected += np.where(A_dangerous, alive * P_INJURY * (A_score + WIN_PAYOFF + time_bonus), 0)
+        alive = np.where(A_dangerous, alive * (1 - P_INJURY), alive)
+
+        B_dangerous = B_move == D
+        expected += np.where(B_dangerous, alive * P_INJURY * (A_score + SERIOUS_INJURY), 0)
+        alive = np.where(B_dangerous, alive * (1 - P_INJURY), alive)
+        A_score = np.where(B_dangerous, A_score + SCRATCH, A_score)
+
+        last_A, last_B = A_move, B_move
+
+    # Still going after MAX_MOVES is a draw
+    expected += alive * A_score
+    return float(weights @ expected)
+
+# Results are cached per (strategyA, strategyB, contests), so after changing any of the
+# parameters above (P_INJURY, MAX_MOVES, EXACT_PAYOFFS, ...) call clear_cache(), which
+# also rebuilds TIME_BONUS from MAX_MOVES, TIME_BONUS_START and TIME_BONUS_DECREMENT
+payoff_cache = {}
+
+def average_payoff(strategyA_class, strategyB_class, contests=CONTESTS_PER_MATCHUP):
+    # Only return average payoff to strategyA
+    key = (strategyA_class, strategyB_class, contests)
+    if key not in payoff_cache:
+        payoff_cache[key] = compute_payoff(strategyA_class, strategyB_class, contests)
+    return payoff_cache[key]
+
+def compute_payoff(strategyA_class, strategyB_class, contests):
+    # Uncached average payoff to strategyA
+    if EXACT_PAYOFFS:
+        payoff = exact_payoff(strategyA_class, strategyB_class)
+        if payoff is not None:
+            return payoff
+    # Otherwise estimate it by simulation
+    # Read the tags from the classes themselves, a subclass with its own rules has none
+    tagA = strategyA_class.__dict__.get('tag')
+    tagB = strategyB_class.__dict__.get('tag')
+    if _contest_numba is not None and tagA is not None and tagB is not None:
+        params = (MAX_MOVES, P_INJURY, TIME_BONUS_START, TIME_BONUS_DECREMENT,
+                  WIN_PAYOFF, SERIOUS_INJURY, SCRATCH, PROBE_PROB)
+        return _contest_numba.average_payoff(tagA, tagB, contests, params)
+    if not (has_batch_moves(strategyA_class) and has_batch_moves(strategyB_class)):
+        # play_contest resets the players, so one instance of each serves every contest
+        A = strategyA_class()
+        B = strategyB_class()
+        total = 0
+        for _ in range(contests):
+            A_score, B_score = play_contest(A, B)
+            total += A_score
+        return total / contests
+    A_scores, B_scores = batch_play(strategyA_class, strategyB_class, contests)
+    return float(A_scores.mean())
+
+def clear_cache():
+    global TIME_BONUS
+    TIME_BONUS = time_bonus_table()
+    payoff_cache.clear()
+
+def current_params():
+    return {name: globals()[name] for name in PARAM_NAMES}
+
+def seed_worker(params):
+    # Spawned workers re-import this module with the default parameters and forked workers inherit
+    # the parent's generator state, so copy the caller's parameters and start a fresh stream
+    global rng
+    globals().update(params)
+    clear_cache()
+    rng = np.random.default_rng()
+
+def payoff_matrix(strategies, contests=CONTESTS_PER_MATCHUP):
+    # Average payoff to the row strategy against the column strategy
+    cells = [(row_strat, col_strat, contests) for row_strat in strategies for col_strat in strategies]
+    missing = [cell for cell in cells if cell not in payoff_cache]
+    # Simulated cells are independent, so spread them over all cores. Exact payoffs are too cheap
+    # to be worth starting worker processes, and the numba kernel already runs on every core.
+    if missing and not EXACT_PAYOFFS and _contest_numba is None:
+        with Pool(initializer=seed_worker, initargs=(current_params(),)) as pool:
+            payoff_cache.update(zip(missing, pool.starmap(compute_payoff, missing)))
+    results = [average_payoff(*cell) for cell in cells]
+    n = len(strategies)
+    return [results[i * n:(i + 1) * n] for i in range(n)]
+
+def print_payoff_matrix(strategy_names, matrix):
+    print(" " * 20, end="")
+    for name in strategy_names:
+        print(f"{name:>20}", end="")
+    print()
+    for i, row in enumerate(matrix):
+        print(f"{strategy_names[i]:<20}", end="")
+        for val in row:
+            print(f"{val:>20.1f}", end="")
+        print()